@@ -18,8 +18,13 @@ in pkgs.mkShell rec {
                 # be parsimonious with 3rd party dependencies; better to show off your own code than someone else's
                 ipython
                 nose
-                beautifulsoup4
-                requests
+                lxml
+                selectolax
+                aiohttp
+                aiodns
+                httpx
+                h2
+                uvloop
                 urllib3
             ];
         })
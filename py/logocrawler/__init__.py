@@ -1,2 +1,3 @@
+from .breaker import CircuitBreaker, CircuitOpen
 from .crawler import LogoCrawler
 from .utils import *
@@ -0,0 +1,106 @@
+# CircuitBreaker
+# Per-host circuit breaker used by LogoCrawler to fail fast on dead hosts.
+
+from time import monotonic
+
+# -----------------------------------------------------------------------------------
+
+class CircuitOpen(Exception):
+    """
+    Raised when a request is refused because the circuit of its host is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker: Tracks consecutive connection failures per host.
+    Each host moves between three states:
+    - closed: requests flow normally and failures are counted
+    - open: requests are refused with CircuitOpen until the cooldown elapses
+    - half_open: a single trial request is let through and the others are refused;
+      success closes the circuit again, failure re-opens it for another cooldown.
+      A trial that reports neither (e.g. cancelled) expires after a cooldown, and
+      the next request becomes the new trial.
+    Hosts whose last event is more than a cooldown old are forgotten, so hosts that
+    never succeed do not accumulate for the whole run.
+    The crawler runs on a single event loop, so a plain dict is enough to share
+    the state between all concurrent fetches.
+    Attributes:
+        max_failures (int): Consecutive failures that open the circuit of a host
+        cooldown (float): Seconds a host stays open before a trial request
+        hosts (dict): Mapping of host -> (state, fail_count, until), where `until` is the time
+                      of the last failure (closed), the end of the cooldown (open) or the
+                      expiry of the trial request (half_open)
+        next_prune (float): Time of the next sweep of forgotten hosts
+    Example:
+        breaker = CircuitBreaker(max_failures=3, cooldown=30)
+        breaker.check("www.example.com")    # raises CircuitOpen if open
+        breaker.failure("www.example.com")  # after a connection error
+        breaker.success("www.example.com")  # after any answer from the host
+    """
+
+    def __init__(self, max_failures=3, cooldown=30):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.hosts = {}
+        self.next_prune = monotonic() + cooldown
+
+    def check(self, host: str):
+        """
+        Check whether a request to the host is allowed.
+        Once the cooldown of an open host has elapsed, the first caller is let through as
+        the trial request and the host is refused again until the trial reports back.
+        Args:
+            host (str): Host name the request is addressed to.
+        Raises:
+            CircuitOpen: If the circuit of the host is open, or its trial request is in flight.
+        """
+
+        state, fail_count, until = self.hosts.get(host, ("closed", 0, 0))
+        if state == "closed":
+            return
+        now = monotonic()
+        if now < until:
+            raise CircuitOpen(host)
+        self.hosts[host] = ("half_open", fail_count, now + self.cooldown)
+
+    def success(self, host: str):
+        """
+        Record that the host answered, closing its circuit.
+        Args:
+            host (str): Host name that answered.
+        """
+
+        self.hosts.pop(host, None)
+
+    def failure(self, host: str):
+        """
+        Record a connection failure, opening the circuit once `max_failures` is reached.
+        Args:
+            host (str): Host name that failed.
+        """
+
+        now = monotonic()
+        state, fail_count, until = self.hosts.get(host, ("closed", 0, 0))
+        if state == "closed" and until + self.cooldown <= now:
+            # Failures further apart than a cooldown are not consecutive
+            fail_count = 0
+        fail_count += 1
+        if state == "half_open" or fail_count >= self.max_failures:
+            self.hosts[host] = ("open", fail_count, now + self.cooldown)
+        else:
+            self.hosts[host] = ("closed", fail_count, now)
+        if now >= self.next_prune:
+            self.prune(now)
+
+    def prune(self, now: float):
+        """
+        Forget the hosts whose last event is more than a cooldown old: closed hosts that
+        have not failed since, and open or half-open hosts nobody requested since their
+        cooldown or trial ended.
+        Args:
+            now (float): Current monotonic time.
+        """
+
+        self.hosts = {host: entry for host, entry in self.hosts.items() if entry[2] + self.cooldown > now}
+        self.next_prune = now + self.cooldown
@@ -4,49 +4,233 @@
 
 # Imports
 import os
-import requests
+import csv
+import re
+import contextlib
+import itertools
+import operator
+import asyncio
+import threading
+import importlib.util
+import aiohttp
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from time import perf_counter, strftime
-from multiprocessing import Pool
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from pathlib import Path
+import lxml.html
+from lxml import etree
+from urllib.parse import urlsplit
+
+# Minimum versions (see the README): fail at import rather than on every domain,
+# where the missing names would only show up as "Error AttributeError" results
+if not hasattr(asyncio, "timeout"):
+    raise ImportError("LogoCrawler requires Python 3.11 or later (asyncio.timeout)")
+if not hasattr(aiohttp, "ClientConnectorDNSError"):
+    raise ImportError("LogoCrawler requires aiohttp 3.11 or later (ClientConnectorDNSError)")
+
+# Optional imports
+try:
+    import aiodns  # Non-blocking DNS resolution through c-ares, used by aiohttp.AsyncResolver
+except ImportError:
+    aiodns = None
+try:
+    from selectolax.lexbor import LexborHTMLParser  # Lexbor-based parser, faster than lxml for attribute lookups
+except ImportError:
+    LexborHTMLParser = None
+try:
+    import httpx  # HTTP/2 client multiplexing the common-path probes of a host over one connection
+except ImportError:
+    httpx = None
+if httpx is not None and importlib.util.find_spec("h2") is None:
+    httpx = None  # HTTP/2 support of httpx requires h2
+try:
+    import uvloop  # libuv event loop, with cheaper socket I/O than the default asyncio loop
+except ImportError:
+    uvloop = None
+if uvloop is not None and not hasattr(uvloop, "run"):
+    uvloop = None  # uvloop.run requires uvloop 0.18
 
 # Internal imports
-from .utils import allowed_file_extensions, log, protocols, request_header
+from .breaker import CircuitBreaker, CircuitOpen
+from .utils import allowed_file_extensions, common_logo_paths, log, protocols, request_header, url_resolver
 
 # Disclaim
 # This code was documented using LLM.
 
+# CSS selectors for the logo hints of a page with the attribute holding the link, in order of precedence
+logo_css_selectors = (
+    ("og_image", 'meta[property="og:image"][content]:not([content=""])', "content"),
+    ("img_logo", 'img#logo[src]:not([src=""]), img[class*=logo i][src]:not([src=""])', "src"),
+    ("favicon", 'link[rel*=icon i][href]:not([href=""])', "href"),
+)
+
+# Compiled XPath queries for the same hints, used when selectolax is not installed
+# (only the first hit is materialized: libxml2 stops at the first match of a `(...)[1]` query)
+# (links made only of whitespace are skipped, as they would resolve to the page itself)
+og_image_xpath = etree.XPath("(//meta[@property='og:image'][normalize-space(@content)!='']/@content)[1]",
+                             smart_strings=False)
+img_logo_xpath = etree.XPath(
+    "(//img[@id='logo' or contains(translate(@class, 'LOGO', 'logo'), 'logo')][normalize-space(@src)!='']/@src)[1]",
+    smart_strings=False)
+icon_xpath = etree.XPath("(//link[contains(translate(@rel, 'ICON', 'icon'), 'icon')][normalize-space(@href)!='']/@href)[1]",
+                         smart_strings=False)
+
+# lxml HTML parsers of each parsing thread, by encoding
+lxml_parsers = threading.local()
+
+def lxml_parser(encoding):
+    """
+    Return an lxml HTML parser decoding documents with `encoding`, shared by the pages
+    declaring it that are parsed on the calling thread. With no encoding lxml relies on
+    the document's own <meta charset>. A parser parses one document at a time (it holds
+    a lock for the whole parse), so each thread of the parse pool keeps its own.
+    Nodes the logo lookups never visit (comments, processing instructions, whitespace-only
+    text) are dropped while parsing, and no id index is built.
+    """
+    try:
+        parsers = lxml_parsers.by_encoding
+    except AttributeError:
+        parsers = lxml_parsers.by_encoding = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        options = dict(remove_comments=True, remove_pis=True, remove_blank_text=True, collect_ids=False)
+        try:
+            parser = lxml.html.HTMLParser(encoding=encoding, **options)
+        except LookupError:
+            # Unknown charset announced by the server
+            parser = lxml.html.HTMLParser(**options)
+        parsers[encoding] = parser
+    return parser
+
+# Options making Lexbor detect the charset of byte input from its <meta charset>, like lxml does
+# (selectolax >= 1.0; older releases always read bytes as UTF-8)
+lexbor_options = {}
+if LexborHTMLParser is not None:
+    try:
+        LexborHTMLParser(b"", encoding=True)
+        lexbor_options = {"encoding": True}
+    except TypeError:
+        pass
+
+# Errors setting up the connection of a page (refused, unreachable, timed out, TLS handshake
+# or certificate), after which the next protocol is tried. They count against the circuit of
+# the host, as do 5xx answers; other errors (read timeouts, resets) do not.
+connection_setup_errors = (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)
+
+# The same errors for the common-path probes. Timeouts are left out: the probe timeout also
+# covers the wait for a free connection, which says nothing about the host.
+probe_connect_errors = (aiohttp.ClientConnectorError,)
+if httpx is not None:
+    probe_connect_errors += (httpx.ConnectError, httpx.ConnectTimeout)
+
+# Headers of the requests made for a page with the request type they are reported as, in order of attempt
+request_variants = ((request_header, "headed"), (None, "headless"))
+
+# Requests only the first byte of a common-path candidate, enough to learn its status and type
+probe_range_header = {"Range": "bytes=0-0"}
+
+# Columns of the results CSV, and the getter building a row from a result dictionary in C
+result_fields = ("url", "success", "logo_link", "request_type", "message")
+result_row = operator.itemgetter(*result_fields)
+
+# Media types of the pages that are parsed
+html_content_types = frozenset(("text/html", "application/xhtml+xml"))
+
+# 'logo' anywhere in a class attribute, matched case-insensitively without lowercasing a copy of it
+logo_class_pattern = re.compile(r'logo', re.IGNORECASE)
+
+# End of the document <head>, where og:image and icon links live
+head_end_pattern = re.compile(rb'</head\s*>', re.IGNORECASE)
+
+# Charset declared in the page, by <meta charset> or <meta http-equiv="Content-Type" content="...; charset=...">
+meta_charset_pattern = re.compile(rb'<meta\s[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# -----------------------------------------------------------------------------------
+
+class LogoImageTarget:
+    """
+    LogoImageTarget: lxml parser target keeping only the src of the first logo <img>.
+    An <img> is a logo under the same rules as `LogoCrawler.parseLogoLink`: id 'logo'
+    or 'logo' in the class, and a non-empty src. The parser calls the target instead
+    of building a tree, so feeding it a page holds no element in memory.
+    Attributes:
+        src (str): The src of the first logo <img> seen, or None
+    """
+
+    def __init__(self):
+        self.src = None
+
+    def start(self, tag, attrib):
+        if self.src is None and tag == "img":
+            src = attrib.get("src")
+            if src and not src.isspace() and (attrib.get("id") == "logo" or logo_class_pattern.search(attrib.get("class", ""))):
+                self.src = src
+
+    def close(self):
+        return self.src
+
 # -----------------------------------------------------------------------------------
 
 class LogoCrawler:
     """
     LogoCrawler: A web crawler that extracts logo images from websites.
     This class crawls a list of domain names to find their logos using various
-    extraction methods. It supports multithreading for parallel processing and
-    generates detailed output reports.
+    extraction methods and generates detailed output reports.
+    Domains are fetched concurrently by `threads_num` worker tasks on a single asyncio
+    event loop sharing one aiohttp.ClientSession, so many sockets can be in flight at
+    once while waiting on the network. Only the parsing of pages runs on threads, in a
+    pool of `parse_workers` threads (and as many single-thread executors for the body
+    scans), so it never blocks the event loop.
     Extraction methods (in order of attempt):
     1. Common logo paths (/logo.png, /images/logo.png, etc.)
     2. OpenGraph image meta tags
     3. Image elements with 'logo' in their ID or class
     4. Favicon links
+    Hosts that keep failing to connect are skipped for a cooldown period by a
+    per-host circuit breaker, bounding the time spent on dead domains.
     Attributes:
-        threads_num (int): Number of concurrent threads for crawling
+        threads_num (int): Number of domains crawled concurrently
         timeout_time (int): Request timeout in seconds
+        connect_timeout (int): Connection timeout in seconds
+        probe_timeout (aiohttp.ClientTimeout): Timeout of each common-path probe
+        head_read_limit (int): Maximum bytes of a page read before parsing its head
+        read_chunk_size (int): Bytes per streamed read of a page
+        max_document_size (int): Maximum bytes of a page read in total
+        drain_limit (int): Maximum declared size of an error page read to reuse its connection
+        host_connections (int): Maximum number of connections of a worker to one host
+        domain_timeout (float): Seconds a domain may take at most, from its first request to its logo
+        dns_nameservers (list): DNS servers used by the asynchronous resolver, or None for the system ones
+        dns_cache_ttl (int): Seconds DNS answers are cached for
         verbose (bool): Whether to print detailed progress messages
         output_file (str): Path to save the results CSV file
         metrics_file (str): Path to save the metrics report
         domains_list (list): List of domains to crawl
-        results (list): Results of the crawling process
+        result_types (Counter): Results per (request type, success, message) outcome
+        breaker (CircuitBreaker): Per-host circuit breaker shared by all requests
+        probe_client (httpx.AsyncClient): HTTP/2 client for the common-path probes, or None
+        parse_workers (int): Number of threads parsing pages
+        parse_pool (ThreadPoolExecutor): Threads parsing the pages, or None
+        scan_pools (itertools.cycle): Single-thread executors the body scans are spread over, or None
+        origin_probes (dict): Common-path probe batch, or its result once done, of the origins crawled last
+        origin_probes_limit (int): Maximum number of probe results kept in `origin_probes`
     Methods:
-        run(): Executes the crawling process using multiprocessing
+        run(): Executes the crawling process on an asyncio event loop
+        crawl(writer): Fetches all domains concurrently with a shared aiohttp session
         setInputFile(filename): Sets and validates the input file
         checkFileExtension(filename): Validates file extension
         filenameExists(filename): Checks if the input file exists
         readCompleteInputFile(): Reads domains from the input file
-        fetchDomain(domain): Fetches and processes a single domain
-        parseLogoLink(response): Extracts logo URL from HTTP response
-        exportResults(results): Exports crawler results to CSV
-        exportMetrics(results): Generates and exports performance metrics
+        fetchDomain(session, domain): Fetches and processes a single domain
+        openPage(session, url): Requests a page, with and without browser headers
+        errorMessage(error): Describes a failed request
+        readLogoLink(session, response): Probes common paths and streams a page for a logo link
+        scanLogoImage(response, prefix, base_url): Streams the rest of a page for a logo <img>
+        probeCommonPaths(session, base_url): Probes common logo file paths once per origin
+        probeOrigin(session, host, origin): Probes common logo file paths concurrently
+        probePath(session, host, logo_url): Checks whether a URL serves an image
+        parseLogoLink(content, base_url, encoding): Extracts logo URL from an HTML document
+        exportResult(writer, result): Writes one result to CSV and updates the metrics
+        exportMetrics(): Generates and exports performance metrics
     Example:
         crawler = LogoCrawler(
             filename="domains.txt", 
@@ -57,29 +241,56 @@ class LogoCrawler:
         )
     """
     
-    def __init__(self, filename=None, threads_num=1, output_file="output.csv", metrics_file="metrics.csv", verbose=False):
+    def __init__(self, filename=None, threads_num=64, output_file="output.csv", metrics_file="metrics.csv", verbose=False,
+                 dns_nameservers=None, dns_cache_ttl=600):
         """
         Initializes a new instance of the crawler.
         This constructor sets up the crawler with specified parameters, reads domains from an input file,
         and starts the crawling process.
         Args:
             filename (str, optional): Path to the input file containing domains to crawl. Defaults to None.
-            threads_num (int, optional): Number of concurrent threads to use for crawling. Defaults to 1.
+            threads_num (int, optional): Number of domains to crawl concurrently. Defaults to 64.
             output_file (str, optional): Path to save crawling results. Defaults to "output.csv".
             metrics_file (str, optional): Path to save crawling metrics. Defaults to "metrics.csv".
             verbose (bool, optional): Whether to display detailed output. Defaults to False.
+            dns_nameservers (list, optional): DNS servers to resolve names with, e.g. ["1.1.1.1", "8.8.8.8"].
+                Requires aiodns. Defaults to None (system resolvers).
+            dns_cache_ttl (int, optional): Seconds DNS answers are cached for. Defaults to 600.
+        Raises:
+            ImportError: If `dns_nameservers` are given but aiodns is not installed.
         """
         
+        # The system resolvers would otherwise be used silently
+        if dns_nameservers and aiodns is None:
+            raise ImportError("Custom DNS servers require aiodns, which is not installed.")
+        
         # Crawler properties
-        self.threads_num = threads_num  # Number of concurrent processes
+        self.threads_num = threads_num  # Number of domains crawled concurrently
         self.timeout_time = 5  # Define timeout time
+        self.connect_timeout = 2  # Connection failures should trip the breaker quickly
+        self.probe_timeout = aiohttp.ClientTimeout(total=2)  # Common-path probes are just existence checks
+        self.head_read_limit = 1 << 18  # Bytes of a page read while looking for the end of <head>
+        self.read_chunk_size = 8192  # Bytes per streamed read of a page
+        self.max_document_size = 2_000_000  # Bytes of a page read at most
+        self.drain_limit = 1 << 16  # Largest error page read to keep its connection reusable
+        self.host_connections = 4  # Connections a worker may open to one host (its page and the probes)
+        self.domain_timeout = 8  # Deadline of each domain, bounding the time a worker spends on it
+        self.dns_nameservers = dns_nameservers  # DNS servers queried through aiodns (None: system resolvers)
+        self.dns_cache_ttl = dns_cache_ttl  # Seconds a resolved host is reused by every request to it
         self.verbose = verbose
         self.output_file = output_file
         self.metrics_file = metrics_file
 
         # Crawler variables
         self.domains_list = []  # List of all urls to be fetched
-        self.results = []   # Results from fetched urls
+        self.result_types = Counter()  # Outcomes breakdown, split into the metrics at export
+        self.breaker = CircuitBreaker()  # Fail fast on hosts that keep refusing connections
+        self.probe_client = None  # HTTP/2 client for the probes, only while crawling with httpx installed
+        self.parse_workers = os.cpu_count() or 1  # Threads parsing pages alongside the event loop
+        self.parse_pool = None  # Parsing threads, only while crawling
+        self.scan_pools = None  # Single-thread executors of the body scans, only while crawling
+        self.origin_probes = {}  # Origin -> task probing its common logo paths, then the logo URL it found
+        self.origin_probes_limit = 1 << 16  # Probe results kept, so memory does not grow with the input
         log("Crawler initialized.")
         
         # Execute
@@ -89,20 +300,37 @@ class LogoCrawler:
     
     def run(self):
         """
-        Execute the crawler on all domains in the domains list using a process pool.
-        This method starts a pool of worker processes based on the specified number of threads,
-        processes all domains in parallel, exports the results and metrics, and logs the total
-        execution time.
+        Execute the crawler on all domains in the domains list using an asyncio event loop.
+        This method opens the results CSV, drives `crawl` to completion while each result
+        is written as soon as it is ready, exports the metrics, and logs the total
+        execution time. The event loop is uvloop's when it is installed.
         Returns:
             None
+        Side effects:
+            - Creates 'output' directory if it doesn't exist
+            - Writes to a file at self.output_file
+            - Updates self.output_file to include the 'output/' directory prefix
         """
         
-        log(f"Running Crawler using {self.threads_num} thread(s) for {len(self.domains_list)} name domains.")
+        log(f"Running Crawler using {self.threads_num} worker(s) for {len(self.domains_list)} name domains.")
         self.app_start_time = perf_counter()
-        with Pool(processes=self.threads_num) as pool:
-            results = pool.map(self.fetchDomain, self.domains_list)
-        self.exportResults(results)
-        self.exportMetrics(results)
+        
+        log(f"Exporting results to output/{self.output_file}")
+        
+        # Create output directory if it doesn't exist
+        os.makedirs("output", exist_ok=True)
+        
+        self.output_file = f"output/{self.output_file}"
+        
+        with open(self.output_file, "w", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            # Write header row
+            writer.writerow(result_fields)
+            # Results are written as they complete
+            run_loop = uvloop.run if uvloop else asyncio.run
+            run_loop(self.crawl(writer))
+        
+        self.exportMetrics()
         
         # Finish
         app_end_time = perf_counter()
@@ -111,7 +339,66 @@ class LogoCrawler:
         minutes = int((total_time % 3600) // 60)
         seconds = total_time % 60
         print(f"Crawler finished in {hours}h {minutes}m {seconds:.2f}s")
+    
+    async def crawl(self, writer):
+        """
+        Fetch every domain concurrently using a single shared aiohttp session.
+        A fixed number of worker tasks pull domains from a shared iterator, so only
+        `threads_num` domains are crawled at any time regardless of the input size.
+        The connector caps the number of open sockets to `host_connections` per worker
+        (and per host), so a worker never waits for another one to free a connection,
+        and keeps idle connections alive so requests to the same host skip the TCP/TLS
+        handshake. DNS answers are cached for `dns_cache_ttl` seconds and, when aiodns is
+        installed, resolved asynchronously instead of through getaddrinfo on a thread pool.
+        When httpx is installed, the common-path probes go through a separate HTTP/2
+        client so that all probes to a host share a single multiplexed connection. That
+        client has its own connection pool and resolves names itself, outside of the
+        aiohttp DNS cache. Both clients follow redirects.
+        Pages are parsed by a dedicated pool of `parse_workers` threads, so parsing never
+        runs on the event loop and never queues behind the DNS lookups of the default
+        executor. Threads rather than processes: a head prefix parses quickly, and worker
+        processes would re-import the caller's main module (re-running an unguarded script).
+        The body scans (see `scanLogoImage`) get `parse_workers` single-thread executors
+        of their own, as each scan must stay on one thread.
+        Args:
+            writer (csv.writer): Writer receiving one row per domain, in completion order.
+        Returns:
+            None
+        """
+        
+        # Connections are kept alive in the pool long enough for the common-path probes
+        # of a domain to reuse the socket opened by its page request (when the probes go
+        # through this session, i.e. httpx is not installed)
+        resolver = aiohttp.AsyncResolver(nameservers=self.dns_nameservers) if aiodns else None
+        connector = aiohttp.TCPConnector(limit=self.threads_num * self.host_connections,
+                                         limit_per_host=self.host_connections, keepalive_timeout=30,
+                                         resolver=resolver, use_dns_cache=True, ttl_dns_cache=self.dns_cache_ttl)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_time, sock_connect=self.connect_timeout)
+        domains = iter(self.domains_list)
+        
+        async def worker(session):
+            # Each domain is taken from the shared iterator by exactly one worker
+            for domain in domains:
+                self.exportResult(writer, await self.fetchDomain(session, domain))
         
+        async with contextlib.AsyncExitStack() as stack:
+            session = await stack.enter_async_context(aiohttp.ClientSession(connector=connector, timeout=timeout))
+            if httpx is not None:
+                self.probe_client = await stack.enter_async_context(httpx.AsyncClient(
+                    http2=True,
+                    follow_redirects=True,  # Like aiohttp, so a path redirecting to an image is a hit either way
+                    timeout=httpx.Timeout(self.probe_timeout.total, connect=self.connect_timeout),
+                    limits=httpx.Limits(max_connections=self.threads_num * self.host_connections),
+                ))
+            self.parse_pool = stack.enter_context(ThreadPoolExecutor(
+                max_workers=self.parse_workers, thread_name_prefix="parse"))
+            self.scan_pools = itertools.cycle([stack.enter_context(ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scan")) for _ in range(self.parse_workers)])
+            await asyncio.gather(*[worker(session) for _ in range(self.threads_num)])
+        self.probe_client = None
+        self.parse_pool = None
+        self.scan_pools = None
+    
     def setInputFile(self, filename):
         """
         Set the input file to be used for processing.
@@ -147,8 +434,8 @@ class LogoCrawler:
     def checkFileExtension(self, filename: str):
         """
         Checks if the file extension is in the list of allowed file extensions.
-        This method splits the filename at the dot and verifies the extension 
-        against a predefined list of allowed extensions.
+        This method takes the extension after the last dot of the filename (ignoring
+        case) and verifies it against a predefined set of allowed extensions.
         Parameters:
         ----------
         filename : str
@@ -162,27 +449,29 @@ class LogoCrawler:
             If the file extension is not in the list of allowed file extensions
         """
         
-        ext = filename.split(".")[1]
+        ext = os.path.splitext(filename)[1][1:].lower()
         if ext not in allowed_file_extensions:
-            raise ValueError(f"Unsupported extension `{ext}`. Expected of of: {', '.join(allowed_file_extensions)}")
+            raise ValueError(f"Unsupported extension `{ext}`. Expected one of: {', '.join(sorted(allowed_file_extensions))}")
 
     def filenameExists(self, filename):
         """
-        Check if a file exists at the given path.
+        Check if a regular file exists at the given path.
+        Directories are rejected here, with a single stat call, rather than failing
+        later when the file is read.
         Args:
             filename (str): The path to the file to check.
         Returns:
             bool: True if the file exists, False otherwise.
         """
         
-        return os.path.exists(filename)
+        return os.path.isfile(filename)
     
     def readCompleteInputFile(self):
         """
         Reads the domains from the input file specified by self.filename.
-        The method opens the file, reads all lines, and stores the stripped domain names
-        in the self.domains_list attribute. Each line in the file is expected to contain
-        a single domain name.
+        The method reads the whole file at once and splits it on whitespace, storing the
+        domain names in the self.domains_list attribute. Each line in the file is expected
+        to contain a single domain name; blank lines are skipped.
         Returns:
             None
         Side effects:
@@ -190,18 +479,23 @@ class LogoCrawler:
             - Logs a success message upon completion
         """
         
-        with open(self.filename) as f:
-            content = f.readlines()
-        self.domains_list = [x.strip() for x in content]
+        self.domains_list = Path(self.filename).read_text().split()
         log("Successfully read domain names from input file.")
     
-    def fetchDomain(self, domain: str) -> dict:
+    async def fetchDomain(self, session: aiohttp.ClientSession, domain: str) -> dict:
         """
         Fetches and processes a website domain to extract logo information.
-        This method attempts to access the website using different protocols (http, https)
-        and request methods (headed, headless) until a successful response is received.
-        It then parses the response to find a logo link.
+        This method attempts to access the website over https, with and without browser
+        headers (headed, headless), until a successful response is received. http is only
+        tried when no connection could be set up over https (refused, unreachable, timed
+        out, or a TLS handshake or certificate error); an error answered over https is final.
+        Domains whose name does not resolve are given up after the first attempt.
+        The logo is then looked up in common logo paths and in the page (see `readLogoLink`).
+        The whole process is bounded by `domain_timeout` seconds. Each worker handles one
+        domain at a time and the connector has room for the connections of every worker,
+        so this time is not spent waiting for other domains to free a connection.
         Args:
+            session (aiohttp.ClientSession): Shared session used for all requests
             domain (str): The domain name to fetch (without protocol, e.g., "example.com")
         Returns:
             dict: A dictionary containing the following keys:
@@ -217,167 +511,446 @@ class LogoCrawler:
         if self.verbose: log(f"Fetching: {domain}")
         
         last_exception = None
-        response = None
         logo_link = None
         header_type = None
         url = None
         message = "not_attempted"
+        page = None
         
-        # Try 'http' and 'https' and 'no' protocols
-        for protocol in protocols:
-            url = protocol + domain
-            # Try headed and headless requests
-            try:
-                # Headed request
-                response = requests.get(url, timeout=self.timeout_time, headers=request_header)
-                if response:
-                    header_type = "headed"
-                    break                    
-                else:
-                    # Headless request if failed headed request
-                    response = response = requests.get(url, timeout=self.timeout_time)
-                    if response:
-                        header_type = "headless"
+        try:
+            async with asyncio.timeout(self.domain_timeout):
+                # Try 'https' first, then 'http' if 'https' could not connect
+                for protocol in protocols:
+                    try:
+                        page = await self.openPage(session, protocol + domain)
                         break
+                    except aiohttp.ClientConnectorDNSError:
+                        # The name does not resolve: the next protocol would fail the same way
+                        raise
+                    except connection_setup_errors as e:
+                        last_exception = self.errorMessage(e)
                 
-            except Exception as e:
-                last_exception = f"Error {e.__class__.__name__}"
-                if hasattr(e, 'response') and e.response is not None:
-                    last_exception = f"{e.response.status_code}"
+                if page:
+                    url, response, request_type = page
+                    async with response:
+                        logo_link, message = await self.readLogoLink(session, response)
+                    header_type = request_type
+        
+        except Exception as e:
+            last_exception = self.errorMessage(e)
         
-        if response:
-            logo_link, message = self.parseLogoLink(response)
+        if not header_type:
+            message = f"{last_exception}"
         
-        return {"url": url if response else domain,                                     # The URL with protocol (e.g., "https://example.com")
+        return {"url": url if header_type else domain,                                  # The URL with protocol (e.g., "https://example.com")
                             "logo_link": f"{logo_link}",                                # URL to the logo image or None if not found
                             "success": True if logo_link else False,                    # Boolean: True if found logo_link, False otherwise
-                            "request_type": header_type if response else None,          # String: "headed" when using headers, "headless" without headers
-                            "message": message if logo_link else f"{last_exception}"    # String: success message or error description
+                            "request_type": header_type,                                # String: "headed" when using headers, "headless" without headers
+                            "message": message                                          # String: success message, not_found/non_html or error description
                             }
     
-    def parseLogoLink(self, response: requests.Response):
+    async def openPage(self, session: aiohttp.ClientSession, url: str):
+        """
+        Requests a page with browser headers, then without them if the server rejected it.
+        Failures to connect to the host and 5xx answers are recorded in its circuit
+        breaker, and requests to a host whose circuit is open are not made at all.
+        Args:
+            session (aiohttp.ClientSession): Shared session used for all requests
+            url (str): The URL of the page, with protocol
+        Returns:
+            tuple: A tuple containing:
+                - str: The requested URL
+                - aiohttp.ClientResponse: The successful response, whose body was not read yet
+                - str: "headed" or "headless", the request that succeeded
+        Raises:
+            CircuitOpen: If the circuit of the host is open
+            aiohttp.ClientResponseError: If both requests were answered with an error status
+            Exception: Any error raised by the requests
+        """
+        
+        host = urlsplit(url).hostname
+        self.breaker.check(host)
+        try:
+            for headers, request_type in request_variants:
+                response = await session.get(url, headers=headers)
+                if response.ok:
+                    self.breaker.success(host)
+                    return url, response, request_type
+                try:
+                    if response.content_length is not None and response.content_length <= self.drain_limit:
+                        # Reading a small error page fully returns its keep-alive connection
+                        # to the pool, so the next request skips the TCP/TLS handshake
+                        await response.read()
+                finally:
+                    response.release()
+            
+            if response.status >= 500:
+                self.breaker.failure(host)
+            else:
+                self.breaker.success(host)
+            response.raise_for_status()
+        except connection_setup_errors:
+            self.breaker.failure(host)
+            raise
+    
+    @staticmethod
+    def errorMessage(error: Exception) -> str:
+        """
+        Describes a failed request for the results and metrics.
+        Args:
+            error (Exception): The error raised while fetching a domain
+        Returns:
+            str: The status code of an error response, "circuit_open" for a host skipped by
+                 its circuit breaker, or "Error <exception class>" otherwise
+        """
+        
+        if isinstance(error, CircuitOpen):
+            return "circuit_open"
+        if isinstance(error, aiohttp.ClientResponseError):
+            return f"{error.status}"
+        return f"Error {error.__class__.__name__}"
+    
+    async def readLogoLink(self, session: aiohttp.ClientSession, response: aiohttp.ClientResponse):
+        """
+        Finds the logo link of a page, reading and parsing as little of it as possible.
+        Common logo paths are probed (see `probeCommonPaths`) while the body is streamed
+        until the end of `<head>` (or `head_read_limit` bytes). A common path takes
+        precedence over anything in the page, so on a hit the page is never parsed.
+        Otherwise the prefix is parsed, since og:image and icon links live in the head.
+        The rest of the body is only scanned for a logo <img> (see `scanLogoImage`) when
+        the prefix holds neither an og:image nor a logo <img>. Responses declaring a
+        non-HTML Content-Type (images, PDFs, ...) are never read, only probed.
+        Parsing runs in the `parse_pool` threads (in the default executor when there is
+        no pool) so that large pages do not stall the event loop while other domains are
+        being downloaded.
+        Args:
+            session (aiohttp.ClientSession): Shared session used for the probes
+            response (aiohttp.ClientResponse): A successful response whose body was not read yet
+        Returns:
+            tuple: A tuple containing:
+                - str or None: The URL of the logo if found, None otherwise
+                - str: Source of the logo ("common_path", "og_image", "img_logo", "favicon"),
+                  "non_html" or "not_found"
         """
-        Extracts logo URL from a website by examining various common locations.
+        
+        base_url = str(response.url)
+        # A missing Content-Type is common on small sites, so only an explicit non-HTML type is skipped
+        content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        is_html = not content_type or content_type in html_content_types
+        
+        probes = asyncio.create_task(self.probeCommonPaths(session, base_url))
+        try:
+            buffer = bytearray()
+            if is_html:
+                async for chunk in response.content.iter_chunked(self.read_chunk_size):
+                    # Only search the new bytes, plus enough overlap for a tag split across chunks
+                    search_from = max(0, len(buffer) - 16)
+                    buffer += chunk
+                    if head_end_pattern.search(buffer, search_from) or len(buffer) >= self.head_read_limit:
+                        break
+            
+            logo_link = await probes
+        finally:
+            probes.cancel()
+        
+        if logo_link:
+            return logo_link, "common_path"
+        if not is_html:
+            return None, "non_html"
+        
+        logo_link, message = await asyncio.get_running_loop().run_in_executor(
+            self.parse_pool, LogoCrawler.parseLogoLink, bytes(buffer), base_url, response.charset)
+        if message in ("og_image", "img_logo") or response.content.at_eof():
+            return logo_link, message
+        
+        # A favicon is only the last resort: a logo <img> further down the body takes precedence
+        img_link = await self.scanLogoImage(response, buffer, base_url)
+        if img_link:
+            return img_link, "img_logo"
+        return logo_link, message
+    
+    async def scanLogoImage(self, response: aiohttp.ClientResponse, prefix: bytearray, base_url: str):
+        """
+        Looks for a logo <img> in the rest of a page while it is being downloaded.
+        The remaining body is fed chunk by chunk to an lxml parser calling a
+        `LogoImageTarget`, which builds no tree, and reading stops at the first <img>
+        matching the same rules as `parseLogoLink` or after `max_document_size` bytes, so
+        the page is neither buffered nor parsed a second time. The chunks are parsed off
+        the event loop, all of them on the same thread: one of the single-thread
+        `scan_pools` executors, taken in turn. A feed parser uses the libxml2 dictionary
+        of the thread that fed it first, so feeding it from another thread while that
+        one parses other pages corrupts memory. Without executors (outside of `crawl`)
+        the chunks are fed on the event loop.
+        The parser starts past the <meta charset> of the page, so the charset declared in
+        `prefix` is passed to it when the server announced none, as with `parseLogoLink`.
+        Args:
+            response (aiohttp.ClientResponse): The response whose `prefix` was already read
+            prefix (bytearray): The bytes of the page read so far
+            base_url (str): The final URL of the page, used to resolve the link
+        Returns:
+            str or None: The URL of the logo image if found before `max_document_size` bytes, None otherwise
+        """
+        
+        encoding = response.charset
+        if not encoding:
+            match = meta_charset_pattern.search(prefix)
+            encoding = match.group(1).decode("ascii") if match else None
+        target = LogoImageTarget()
+        try:
+            parser = etree.HTMLParser(target=target, encoding=encoding)
+        except LookupError:
+            parser = etree.HTMLParser(target=target)
+        loop = asyncio.get_running_loop()
+        pool = next(self.scan_pools) if self.scan_pools else None
+        
+        async def run(function, *args):
+            return function(*args) if pool is None else await loop.run_in_executor(pool, function, *args)
+        
+        # Start from the last tag of the prefix, which may have been cut by the read limit
+        tag_start = prefix.rfind(b"<")
+        if tag_start >= 0:
+            await run(parser.feed, bytes(prefix[tag_start:]))
+        size = len(prefix)
+        if not target.src:
+            async for chunk in response.content.iter_chunked(self.read_chunk_size):
+                size += len(chunk)
+                await run(parser.feed, chunk)
+                if target.src or size >= self.max_document_size:
+                    break
+        # The parse is ended on its own thread too (a document with no element fails to close)
+        with contextlib.suppress(etree.LxmlError):
+            await run(parser.close)
+        
+        return url_resolver(base_url)(target.src) if target.src else None
+    
+    async def probeCommonPaths(self, session: aiohttp.ClientSession, base_url: str):
+        """
+        Probes common logo file paths on the website's origin.
+        Each origin (scheme and host) is probed only once per crawl: domains redirecting
+        to the same site, and concurrent fetches of it, share the batch started by the
+        first one (see `probeOrigin`). A batch that could not check every path (circuit
+        open, connection or timeout errors) is not kept, so later domains of the origin
+        probe it again. Only the last `origin_probes_limit` results are kept, the oldest
+        ones being dropped first, so the cache does not grow with the number of origins.
+        Args:
+            session (aiohttp.ClientSession): Shared session used for all requests
+            base_url (str): The final URL of the fetched page, used to resolve the paths
+        Returns:
+            str or None: The URL of the first path answering with an image, None otherwise
+        """
+        
+        parts = urlsplit(base_url)
+        host = parts.hostname
+        origin = f"{parts.scheme}://{parts.netloc}"
+        batch = self.origin_probes.get(origin)
+        if batch is None:
+            batch = asyncio.ensure_future(self.probeOrigin(session, host, origin))
+            self.origin_probes[origin] = batch
+            
+            def keep_result(done):
+                # Finished batches are replaced by their result ("" for no hit), so the memory
+                # held per origin stays a short string instead of a whole task. Results are
+                # reinserted at the end of the dict, which thus lists the oldest ones first.
+                del self.origin_probes[origin]
+                if done.cancelled() or done.exception() is not None or done.result() is None:
+                    return
+                self.origin_probes[origin] = done.result()
+                if len(self.origin_probes) > self.origin_probes_limit:
+                    oldest = next(key for key, entry in self.origin_probes.items()
+                                  if not isinstance(entry, asyncio.Future))
+                    del self.origin_probes[oldest]
+            batch.add_done_callback(keep_result)
+        
+        if not isinstance(batch, asyncio.Future):
+            return batch or None
+        # Shielded: a caller giving up must not cancel a batch other domains are waiting on
+        return await asyncio.shield(batch)
+    
+    async def probeOrigin(self, session: aiohttp.ClientSession, host: str, origin: str):
+        """
+        Probes all common logo file paths of an origin with concurrent requests.
+        All paths are requested at once and the first one to answer with an image wins;
+        the remaining probes are cancelled.
+        Args:
+            session (aiohttp.ClientSession): Shared session used for all requests
+            host (str): Host of the origin, used as the circuit breaker key
+            origin (str): Scheme and host the paths are appended to (e.g. "https://www.example.com")
+        Returns:
+            str or None: The URL of the first path answering with an image, "" if every path
+                         answered without one, None if some path could not be checked
+        """
+        
+        # Try to find logo in common paths
+        probes = [asyncio.create_task(self.probePath(session, host, origin + path))
+                  for path in common_logo_paths]
+        conclusive = True
+        try:
+            for probe in asyncio.as_completed(probes):
+                logo_url = await probe
+                if logo_url:
+                    return logo_url
+                conclusive = conclusive and logo_url is not None
+        finally:
+            for probe in probes:
+                probe.cancel()
+        
+        return "" if conclusive else None
+    
+    async def probePath(self, session: aiohttp.ClientSession, host: str, logo_url: str):
+        """
+        Checks with a single-byte range request whether a URL serves an image.
+        A GET for `bytes=0-0` answers with the status and Content-Type in one round trip
+        like a HEAD, but is also served properly by the CDNs that handle HEAD poorly. The
+        byte of a partial (206) answer is read so its connection can be reused, while a
+        server ignoring the range has its response closed unread.
+        The request goes through the HTTP/2 `probe_client` when available, and through
+        the aiohttp session otherwise.
+        Args:
+            session (aiohttp.ClientSession): Shared session used for all requests
+            host (str): Host of the URL, used as the circuit breaker key
+            logo_url (str): The candidate logo URL
+        Returns:
+            str or None: `logo_url` if it answered 200 or 206 with an image Content-Type, "" if
+                         it answered otherwise, None if it could not be checked
+        """
+        
+        try:
+            self.breaker.check(host)
+            if self.probe_client is not None:
+                async with self.probe_client.stream("GET", logo_url, headers=probe_range_header) as res:
+                    status = res.status_code
+                    if status == 206:
+                        await res.aread()
+            else:
+                async with session.get(logo_url, headers=probe_range_header, timeout=self.probe_timeout) as res:
+                    status = res.status
+                    if status == 206:
+                        await res.read()
+            if status >= 500:
+                self.breaker.failure(host)
+                return None
+            self.breaker.success(host)
+            if status in (200, 206) and 'image' in res.headers.get('Content-Type', ''):
+                return logo_url
+            return ""
+        except CircuitOpen:
+            pass
+        except probe_connect_errors:
+            self.breaker.failure(host)
+        except Exception:
+            pass
+        
+        return None
+    
+    @staticmethod
+    def parseLogoLink(content: bytes, base_url: str, encoding: str = None):
+        """
+        Extracts logo URL from a website's HTML by examining various common locations.
         This method searches for a logo in the following order:
-        1. Common logo file paths
-        2. Open Graph image meta tag
-        3. Image tags with 'logo' in the id or class attributes
-        4. Favicon links
+        1. Open Graph image meta tag
+        2. Image tags with 'logo' in the id or class attributes
+        3. Favicon links
+        The page is parsed with selectolax (Lexbor) and each location is a CSS selector
+        query; when selectolax is not installed, lxml is used instead with a precompiled
+        XPath query per location.
+        Common logo file paths are probed beforehand by `probeCommonPaths`, and this
+        method is only called when none of them exists.
+        It does not depend on the crawler's state, so it can run on any thread.
         Args:
-            response (requests.Response): The HTTP response object from the website
+            content (bytes): The raw HTML document of the website; the parser detects its encoding
+            base_url (str): The final URL of the document, used to resolve relative links
+            encoding (str, optional): Charset from the response's Content-Type header, used to
+                decode the document. Defaults to None (detect from the document).
         Returns:
             tuple: A tuple containing:
                 - str or None: The URL of the logo if found, None otherwise
-                - str: Source of the logo ("common_path", "og_image", "img_logo", "favicon") or "not_found"
+                - str: Source of the logo ("og_image", "img_logo", "favicon") or "not_found"
         Example:
-            >>> logo_url, source = crawler.parseLogoLink(response)
+            >>> logo_url, source = crawler.parseLogoLink(html, "https://example.com/")
             >>> if logo_url:
             >>>     print(f"Logo found at {logo_url} via {source}")
             >>> else:
             >>>     print("No logo found")
         """
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        base_url = response.url
-
-        # Search order: common_paths -> og:image -> img_logo -> favicon
+        resolve = url_resolver(base_url)
+        if LexborHTMLParser is not None:
+            if encoding:
+                # The charset declared by the server takes precedence over the document's,
+                # as with lxml's parser
+                try:
+                    content = content.decode(encoding, errors="replace")
+                except LookupError:
+                    # Unknown charset announced by the server
+                    pass
+            tree = LexborHTMLParser(content, **lexbor_options)
+            
+            # Search order: og:image -> img_logo -> favicon
+            for source, selector, attribute in logo_css_selectors:
+                node = tree.css_first(selector)
+                if node:
+                    logo_link = resolve(node.attributes[attribute])
+                    if logo_link is None:
+                        # The first match only holds whitespace: fall back to the other matches
+                        links = (resolve(node.attributes[attribute]) for node in tree.css(selector))
+                        logo_link = next(filter(None, links), None)
+                    if logo_link:
+                        return logo_link, source
+            
+            # Failed: logo not found
+            return None, "not_found"
         
-        # Common Paths
-        common_logo_paths = [
-            "/logo.png", 
-            "/images/logo.png", 
-            "/static/logo.svg", 
-            "/assets/logo.png", 
-            "/img/logo.png"
-            ]
+        try:
+            tree = lxml.html.fromstring(content, parser=lxml_parser(encoding))
+        except etree.ParserError:
+            # Empty document
+            return None, "not_found"
+
+        # Search order: og:image -> img_logo -> favicon
         
-        # Try to find logo in common paths
-        for path in common_logo_paths:
-            logo_url = urljoin(base_url, path)
-            try:
-                res = requests.head(logo_url, timeout=5)
-                if res.status_code == 200 and 'image' in res.headers.get('Content-Type', ''):
-                    return logo_url, "common_path"
-            except:
-                continue
-            
         # Try to find logo in meta og:image tag or content
-        meta_og_tags = soup.find('meta', property='og:image')
-        if meta_og_tags:
-            content = meta_og_tags.get('content')
-            if content:
-                logo_url = urljoin(base_url, content)
-                return logo_url, "og_image"
-
-        # Try to find logo in <img> with id='logo' or class='logo'
-        img_tags = soup.find_all('img')
-        for img_tag in img_tags:
-            classes = img_tag.get('class', [])
-            if img_tag.get('id') == 'logo' or any('logo' in c.lower() for c in classes):
-                src = img_tag.get('src')
-                if src:
-                    logo_url = urljoin(base_url, src)
-                    return logo_url, "img_logo"
-
-        # Try to find icon in <link rel="icon"> or <link rel="shortcut icon">
-        link_icons = soup.find_all('link', rel=lambda x: x and 'icon' in x.lower())
-        for link_tag in link_icons:
-            href = link_tag.get('href')
-            if href:
-                logo_url = urljoin(base_url, href)
-                return logo_url, "favicon"
+        hits = og_image_xpath(tree)
+        if hits and resolve(hits[0]):
+            return resolve(hits[0]), "og_image"
+
+        # Try to find logo in <img> with id='logo' or class='logo' (case-insensitive), with a non-empty src
+        hits = img_logo_xpath(tree)
+        if hits and resolve(hits[0]):
+            return resolve(hits[0]), "img_logo"
+
+        # Try to find icon in <link rel="icon"> or <link rel="shortcut icon">, with a non-empty href
+        hits = icon_xpath(tree)
+        if hits and resolve(hits[0]):
+            return resolve(hits[0]), "favicon"
 
         # Failed: logo not found
         return None, "not_found"
         
-    def exportResults(self, results: list):
+    def exportResult(self, writer, result: dict):
         """
-        Exports the crawling results to a CSV file.
-        This method creates an output directory if it doesn't exist,
-        then writes the crawling results to a CSV file in that directory.
-        The CSV file includes headers and one row per result with fields:
-        url, success, logo_link, request_type, and message.
+        Exports a single crawling result as soon as it is available.
+        The result is written as one CSV row with fields url, success, logo_link,
+        request_type, and message (csv.writer takes care of quoting fields containing
+        commas or quotes), and its outcome is counted in `result_types`, so no list of
+        results is kept in memory.
         Args:
-            results (list): A list of dictionaries containing the crawling results.
-                            Each dictionary should have keys: 'url', 'success',
-                            'logo_link', 'request_type', and 'message'.
+            writer (csv.writer): Writer of the results CSV file.
+            result (dict): A result dictionary as returned by `fetchDomain`, with keys
+                           'url', 'success', 'logo_link', 'request_type', and 'message'.
         Returns:
             None
-        Side effects:
-            - Creates 'output' directory if it doesn't exist
-            - Writes to a file at self.output_file
-            - Updates self.output_file to include the 'output/' directory prefix
         """
         
-        log(f"Exporting results to output/{self.output_file}")
-        
-        # Create output directory if it doesn't exist
-        os.makedirs("output", exist_ok=True)
-        
-        self.output_file = f"output/{self.output_file}"
-        
-        # Output each result to output file
-        with open(self.output_file, "w+") as f:
-            # Write header row
-            f.write("url, success, logo_link, request_type, message\n")
-            # Results            
-            for result in results:
-                f.write(f"{result['url']}, {result['success']}, \"{result['logo_link']}\", {result['request_type']}, \"{result['message']}\"\n")
+        writer.writerow(result_row(result))
+        self.result_types[result['request_type'], result['success'], result['message']] += 1
 
-    def exportMetrics(self, results: list):
+    def exportMetrics(self):
         """
         Export metrics about logo extraction attempts to a file.
-        This method processes a list of logo extraction results and generates comprehensive metrics,
-        including success/failure rates, types of successes/failures, and request type distribution.
+        This method generates comprehensive metrics from the outcomes counted by
+        `exportResult`, including success/failure rates, types of successes/failures,
+        and request type distribution.
         The metrics are written to a file specified by self.metrics_file in the output directory.
-        Parameters:
-        -----------
-        results : list
-            A list of dictionaries, where each dictionary represents the result of a logo extraction attempt.
-            Expected keys in each dictionary:
-            - 'success': bool, whether the extraction was successful
-            - 'message': str, success type or error message
-            - 'request_type': str, type of request ('headed', 'headless', or None if failed)
         Returns:
         --------
         None
@@ -394,53 +967,51 @@ class LogoCrawler:
         os.makedirs("output", exist_ok=True)
         self.metrics_file = f"output/{self.metrics_file}"
 
-        # Calculate metrics
-        total_requests = len(results)
-        successful_requests = sum(1 for r in results if r['success'])
+        # Split the outcomes into the breakdowns, in a single pass over the distinct ones
+        success_types = Counter()
+        error_types = Counter()
+        request_types = Counter()
+        for (request_type, success, message), count in self.result_types.items():
+            request_types[request_type] += count
+            if success:
+                success_types[message] += count
+            else:
+                error_types[message] += count
+
+        total_requests = sum(request_types.values())
+        successful_requests = sum(success_types.values())
         failed_requests = total_requests - successful_requests
+        headed_requests = request_types['headed']
+        headless_requests = request_types['headless']
+        failed_req_count = request_types[None]
 
-        # Success message types breakdown
-        success_types = {}
-        for result in results:
-            if result['success']:
-                msg_type = result['message']
-                success_types[msg_type] = success_types.get(msg_type, 0) + 1
-
-        # Error message types breakdown
-        error_types = {}
-        for result in results:
-            if not result['success']:
-                error_msg = result['message']
-                error_types[error_msg] = error_types.get(error_msg, 0) + 1
-
-        # Request types
-        headed_requests = sum(1 for r in results if r['request_type'] == 'headed')
-        headless_requests = sum(1 for r in results if r['request_type'] == 'headless')
-        failed_req_count = sum(1 for r in results if r['request_type'] is None)
-
-        # Write metrics to file
-        with open(self.metrics_file, "w+") as f:
-            f.write(f"Total domains processed: {total_requests}\n")
-            f.write(f"Successful logo extractions: {successful_requests} ({successful_requests/total_requests*100:.2f}%)\n")
-            f.write(f"Failed extractions: {failed_requests} ({failed_requests/total_requests*100:.2f}%)\n\n")
-            
-            f.write("Success Breakdown:\n")
-            for success_type, count in sorted(success_types.items(), key=lambda x: x[1], reverse=True):
-                percent_of_success = (count / successful_requests * 100) if successful_requests > 0 else 0
-                percent_of_total = (count / total_requests * 100)
-                f.write(f"- {success_type}: {count} ({percent_of_success:.2f}% of successful, {percent_of_total:.2f}% of total)\n")
-            
-            f.write("\nFailure Breakdown:\n")
-            for error, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True):
-                percent_of_failures = (count / failed_requests * 100) if failed_requests > 0 else 0
-                percent_of_total = (count / total_requests * 100)
-                f.write(f"- {error}: {count} ({percent_of_failures:.2f}% of failures, {percent_of_total:.2f}% of total)\n")
-            
-            f.write("\nRequest Types:\n")
-            f.write(f"- Headed requests: {headed_requests} ({headed_requests/total_requests*100:.2f}%)\n")
-            f.write(f"- Headless requests: {headless_requests} ({headless_requests/total_requests*100:.2f}%)\n")
-            f.write(f"- Failed requests: {failed_req_count} ({failed_req_count/total_requests*100:.2f}%)\n\n")
-            
-            f.write("Common error messages:\n")
-            for error, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True):
-                f.write(f"- {error}: {count} ({count/total_requests*100:.2f}%)\n")
+        # Build the report and write it to file at once
+        error_ranking = error_types.most_common()
+        lines = []
+        lines.append(f"Total domains processed: {total_requests}\n")
+        lines.append(f"Successful logo extractions: {successful_requests} ({successful_requests/total_requests*100:.2f}%)\n")
+        lines.append(f"Failed extractions: {failed_requests} ({failed_requests/total_requests*100:.2f}%)\n\n")
+        
+        lines.append("Success Breakdown:\n")
+        for success_type, count in success_types.most_common():
+            percent_of_success = (count / successful_requests * 100) if successful_requests > 0 else 0
+            percent_of_total = (count / total_requests * 100)
+            lines.append(f"- {success_type}: {count} ({percent_of_success:.2f}% of successful, {percent_of_total:.2f}% of total)\n")
+        
+        lines.append("\nFailure Breakdown:\n")
+        for error, count in error_ranking:
+            percent_of_failures = (count / failed_requests * 100) if failed_requests > 0 else 0
+            percent_of_total = (count / total_requests * 100)
+            lines.append(f"- {error}: {count} ({percent_of_failures:.2f}% of failures, {percent_of_total:.2f}% of total)\n")
+        
+        lines.append("\nRequest Types:\n")
+        lines.append(f"- Headed requests: {headed_requests} ({headed_requests/total_requests*100:.2f}%)\n")
+        lines.append(f"- Headless requests: {headless_requests} ({headless_requests/total_requests*100:.2f}%)\n")
+        lines.append(f"- Failed requests: {failed_req_count} ({failed_req_count/total_requests*100:.2f}%)\n\n")
+        
+        lines.append("Common error messages:\n")
+        for error, count in error_ranking:
+            lines.append(f"- {error}: {count} ({count/total_requests*100:.2f}%)\n")
+
+        with open(self.metrics_file, "w") as f:
+            f.writelines(lines)
@@ -1,8 +1,17 @@
 from time import strftime
+from urllib.parse import urljoin, urlsplit
 
-allowed_file_extensions = ["txt", "csv", "dat"]
+allowed_file_extensions = frozenset(("txt", "csv", "dat"))
 
-protocols = ["https://www.", "http://www.", "www."]
+protocols = ("https://www.", "http://www.")
+
+common_logo_paths = (
+    "/logo.png",
+    "/images/logo.png",
+    "/static/logo.svg",
+    "/assets/logo.png",
+    "/img/logo.png",
+)
 
 request_header = HEADERS = {
         "User-Agent": (
@@ -18,4 +27,33 @@ request_header = HEADERS = {
 def log(message: str):
     timestamp = strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{timestamp}] {message}")
-        
+
+# Characters dropped from links by the URL parser of browsers (line breaks wrapping long attributes)
+url_whitespace = str.maketrans("", "", "\t\n\r")
+
+def url_resolver(base_url: str):
+    """
+    Build a function resolving links against `base_url`, which is parsed only once.
+    Absolute URLs are returned as they are (checked first: og:image links are absolute by
+    the Open Graph spec), scheme-relative (`//host/path`) and root-relative (`/path`) links
+    are resolved by string concatenation; only document-relative links go through urljoin.
+    Like browsers, surrounding whitespace and embedded tabs and line breaks are removed
+    from links, so the resolved URL always fits on one line of the results CSV. A link
+    that is empty once stripped resolves to None rather than to the page itself.
+    """
+    base = urlsplit(base_url)
+    origin = f"{base.scheme}://{base.netloc}"
+
+    def resolve(link: str):
+        link = link.strip().translate(url_whitespace)
+        if not link:
+            return None
+        if link.startswith(("https://", "http://")):
+            return link
+        if link.startswith("//"):
+            return f"{base.scheme}:{link}"
+        if link.startswith("/"):
+            return origin + link
+        return urljoin(base_url, link)
+
+    return resolve
@@ -17,8 +17,8 @@ if __name__ == "__main__":
     )
     # number of threads
     parser.add_argument(
-        "-n", type=int, default=1,
-        help="Number of threads to use (default: 1)"
+        "-n", type=int, default=64,
+        help="Number of domains to crawl concurrently (default: 64)"
     )
     # verbose
     parser.add_argument(
@@ -30,6 +30,16 @@ if __name__ == "__main__":
         "-o", default="output.csv",
         help="CSV file to store results."
     )
+    # DNS servers
+    parser.add_argument(
+        "--dns", nargs="+", default=None, metavar="SERVER",
+        help="DNS servers to resolve names with, e.g. 1.1.1.1 8.8.8.8 (requires aiodns; default: system resolvers)"
+    )
+    # DNS cache duration
+    parser.add_argument(
+        "--dns-ttl", type=int, default=600,
+        help="Seconds DNS answers are cached for (default: 600)"
+    )
     
     # get args
     args = parser.parse_args()
@@ -41,6 +51,8 @@ if __name__ == "__main__":
     
     # Initialize Crawler Object
     crawler = LogoCrawler(filename=input_source, 
-                          threads_num=args.nt, 
+                          threads_num=args.n, 
                           verbose=args.verbose,
-                          output_file=args.o)
\ No newline at end of file
+                          output_file=args.o,
+                          dns_nameservers=args.dns,
+                          dns_cache_ttl=args.dns_ttl)
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Tests of the per-host CircuitBreaker state transitions
+
+import unittest
+from unittest import mock
+
+from logocrawler.breaker import CircuitBreaker, CircuitOpen
+
+# -----------------------------------------------------------------------------------
+
+class CircuitBreakerTest(unittest.TestCase):
+    """
+    Drives a CircuitBreaker on a fake monotonic clock.
+    """
+
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch("logocrawler.breaker.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(max_failures=3, cooldown=30)
+
+    def fail(self, host="a.com", times=1):
+        for _ in range(times):
+            self.breaker.failure(host)
+
+    def test_closed_allows_requests(self):
+        self.breaker.check("a.com")
+        self.fail(times=2)
+        self.breaker.check("a.com")
+        self.assertEqual(self.breaker.hosts["a.com"][:2], ("closed", 2))
+
+    def test_opens_after_max_failures(self):
+        self.fail(times=3)
+        self.assertEqual(self.breaker.hosts["a.com"][0], "open")
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check("a.com")
+        # Other hosts are not affected
+        self.breaker.check("b.com")
+
+    def test_spread_failures_are_not_consecutive(self):
+        self.fail(times=2)
+        self.now += 30
+        self.fail()
+        self.assertEqual(self.breaker.hosts["a.com"][:2], ("closed", 1))
+
+    def test_half_open_lets_a_single_trial_through(self):
+        self.fail(times=3)
+        self.now += 30
+        self.breaker.check("a.com")
+        self.assertEqual(self.breaker.hosts["a.com"][0], "half_open")
+        for _ in range(3):
+            with self.assertRaises(CircuitOpen):
+                self.breaker.check("a.com")
+
+    def test_trial_success_closes(self):
+        self.fail(times=3)
+        self.now += 30
+        self.breaker.check("a.com")
+        self.breaker.success("a.com")
+        self.assertNotIn("a.com", self.breaker.hosts)
+        self.breaker.check("a.com")
+
+    def test_trial_failure_reopens(self):
+        self.fail(times=3)
+        self.now += 30
+        self.breaker.check("a.com")
+        self.fail()
+        self.assertEqual(self.breaker.hosts["a.com"][0], "open")
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check("a.com")
+
+    def test_unreported_trial_expires(self):
+        self.fail(times=3)
+        self.now += 30
+        self.breaker.check("a.com")
+        self.now += 30
+        self.breaker.check("a.com")
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check("a.com")
+
+    def test_prune_forgets_stale_hosts(self):
+        self.fail("dead.com", times=3)
+        self.now += 61
+        self.fail("b.com")
+        self.assertNotIn("dead.com", self.breaker.hosts)
+        self.assertIn("b.com", self.breaker.hosts)
+
+
+if __name__ == "__main__":
+    unittest.main()
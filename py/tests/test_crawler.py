@@ -0,0 +1,325 @@
+# Tests of the asynchronous fetching of LogoCrawler against a local aiohttp server
+
+import asyncio
+import csv
+import io
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from logocrawler import crawler
+from logocrawler.crawler import LogoCrawler
+
+# -----------------------------------------------------------------------------------
+
+# Body bytes put before a logo <img> so that it is only seen by the body scan
+filler = b"<p>" + b"lorem ipsum " * 4000 + b"</p>"
+
+
+def make_crawler(**kwargs):
+    """
+    Build a LogoCrawler whose constructor neither reads an input file nor runs the crawl.
+    """
+    with mock.patch.object(LogoCrawler, "setInputFile"), mock.patch.object(LogoCrawler, "readCompleteInputFile"), \
+            mock.patch.object(LogoCrawler, "run"), mock.patch.object(crawler, "log"):
+        return LogoCrawler(**kwargs)
+
+
+def scan_page(logo=b"/logo.svg", head=b""):
+    """
+    A page whose head holds only a favicon and whose logo <img> is far down the body.
+    """
+    return (b"<html><head>" + head + b'<link rel="icon" href="/favicon.ico"></head><body>'
+            + filler + b'<img id="logo" src="' + logo + b'">' + filler + b"</body></html>")
+
+
+def serve(body, **kwargs):
+    """
+    A request handler answering with a fixed body.
+    """
+    async def handler(request):
+        return web.Response(body=body, **kwargs)
+    return handler
+
+
+class ConstructorTest(unittest.TestCase):
+    """
+    Options checked before anything is crawled.
+    """
+
+    def test_dns_nameservers_require_aiodns(self):
+        with mock.patch.object(crawler, "aiodns", None):
+            with self.assertRaises(ImportError):
+                make_crawler(dns_nameservers=["1.1.1.1"])
+            self.assertIsNone(make_crawler().dns_nameservers)
+
+
+class ServerTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Serves the `routes` of a test on 127.0.0.1 and crawls it over http.
+    """
+
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.add_routes(self.routes())
+        self.server = TestServer(app, host="127.0.0.1")
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        self.origin = f"http://127.0.0.1:{self.server.port}"
+        patcher = mock.patch.object(crawler, "protocols", ("http://",))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.crawler = make_crawler(threads_num=8)
+
+    def routes(self):
+        return []
+
+    async def crawl(self, *paths):
+        """
+        Crawl the given paths of the server, returning the results by URL.
+        """
+        self.crawler.domains_list = [f"127.0.0.1:{self.server.port}{path}" for path in paths]
+        output = io.StringIO()
+        with mock.patch.object(crawler, "log"):
+            await self.crawler.crawl(csv.writer(output))
+        rows = csv.DictReader(io.StringIO(output.getvalue()), fieldnames=crawler.result_fields)
+        return {row["url"]: row for row in rows}
+
+
+class ScanLogoImageTest(ServerTestCase):
+    """
+    Logo <img> found past the head of a page by `scanLogoImage`.
+    """
+
+    def routes(self):
+        async def page(request):
+            number = request.match_info["number"].encode()
+            return web.Response(body=scan_page(b"/logo-" + number + b".svg"), content_type="text/html")
+
+        logo = "/лого.png"
+        return [
+            web.get("/page/{number}", page),
+            # Charset only declared in the page, ahead of the part of the body that is scanned
+            web.get("/meta-charset", serve(
+                scan_page(logo.encode("utf-8"), b"<meta charset='utf-8'>"), content_type="text/html")),
+            web.get("/meta-http-equiv", serve(
+                scan_page(logo.encode("windows-1251"),
+                          b'<meta http-equiv="Content-Type" content="text/html; charset=windows-1251">'),
+                content_type="text/html")),
+            # The charset announced by the server takes precedence over the page's
+            web.get("/header-charset", serve(
+                scan_page(logo.encode("windows-1251"), b"<meta charset='utf-8'>"),
+                content_type="text/html", charset="windows-1251")),
+        ]
+
+    async def test_concurrent_scans(self):
+        # More scans than parsing threads, each fed in many chunks
+        self.crawler.parse_workers = 2
+        results = await self.crawl(*[f"/page/{number}" for number in range(16)])
+        self.assertEqual(len(results), 16)
+        for number in range(16):
+            result = results[f"{self.origin}/page/{number}"]
+            self.assertEqual((result["logo_link"], result["message"]), (f"{self.origin}/logo-{number}.svg", "img_logo"))
+
+    async def test_charset(self):
+        paths = ("/meta-charset", "/meta-http-equiv", "/header-charset")
+        results = await self.crawl(*paths)
+        for path in paths:
+            result = results[self.origin + path]
+            self.assertEqual((result["logo_link"], result["message"]), (f"{self.origin}/лого.png", "img_logo"))
+
+
+class ProbeCommonPathsTest(ServerTestCase):
+    """
+    Common logo paths probed once per origin by `probeCommonPaths`.
+    """
+
+    def routes(self):
+        self.hits = Counter()
+
+        async def logo(request):
+            self.hits[request.path] += 1
+            return web.Response(body=b"\x89PNG", content_type="image/png")
+        return [web.get("/images/logo.png", logo)]
+
+    async def test_results_are_bounded(self):
+        self.crawler.origin_probes_limit = 2
+        self.crawler.origin_probes.update({"http://a.example": "", "http://b.example": "http://b.example/logo.png"})
+        async with aiohttp.ClientSession() as session:
+            logo_link = await self.crawler.probeCommonPaths(session, self.origin + "/")
+        self.assertEqual(logo_link, self.origin + "/images/logo.png")
+        # The oldest result was dropped for the new one
+        self.assertEqual(self.crawler.origin_probes, {"http://b.example": "http://b.example/logo.png",
+                                                      self.origin: self.origin + "/images/logo.png"})
+
+    async def test_one_batch_per_origin(self):
+        async with aiohttp.ClientSession() as session:
+            # Concurrent pages of an origin share the batch of the first one, later ones its result
+            links = await asyncio.gather(*[self.crawler.probeCommonPaths(session, f"{self.origin}/page/{number}")
+                                           for number in range(3)])
+            links.append(await self.crawler.probeCommonPaths(session, self.origin + "/other"))
+        self.assertEqual(links, [self.origin + "/images/logo.png"] * 4)
+        self.assertEqual(self.hits["/images/logo.png"], 1)
+        self.assertEqual(self.crawler.origin_probes, {self.origin: self.origin + "/images/logo.png"})
+
+    async def test_inconclusive_batch_is_not_kept(self):
+        for _ in range(self.crawler.breaker.max_failures):
+            self.crawler.breaker.failure("127.0.0.1")
+        async with aiohttp.ClientSession() as session:
+            self.assertIsNone(await self.crawler.probeCommonPaths(session, self.origin + "/"))
+        self.assertEqual(self.crawler.origin_probes, {})
+
+
+class OpenPageTest(ServerTestCase):
+    """
+    Headed then headless requests of `openPage`, and their effect on the circuit breaker.
+    """
+
+    def routes(self):
+        async def no_browsers(request):
+            # Rejects the browser headers of the headed request
+            return web.Response(status=403 if "Chrome" in request.headers.get("User-Agent", "") else 200)
+        return [
+            web.get("/ok", serve(b"ok")),
+            web.get("/no-browsers", no_browsers),
+            web.get("/missing", serve(b"missing", status=404)),
+            web.get("/broken", serve(b"broken", status=503)),
+        ]
+
+    async def open(self, path):
+        async with aiohttp.ClientSession() as session:
+            url, response, request_type = await self.crawler.openPage(session, self.origin + path)
+            response.release()
+        self.assertEqual(url, self.origin + path)
+        return request_type
+
+    async def test_headed(self):
+        self.assertEqual(await self.open("/ok"), "headed")
+
+    async def test_headless_when_headed_is_rejected(self):
+        self.assertEqual(await self.open("/no-browsers"), "headless")
+
+    async def test_error_status(self):
+        with self.assertRaises(aiohttp.ClientResponseError) as raised:
+            await self.open("/missing")
+        self.assertEqual(crawler.LogoCrawler.errorMessage(raised.exception), "404")
+        # The host answered: not a breaker failure
+        self.assertEqual(self.crawler.breaker.hosts, {})
+
+    async def test_server_error_counts_as_failure(self):
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await self.open("/broken")
+        self.assertEqual(self.crawler.breaker.hosts["127.0.0.1"][:2], ("closed", 1))
+
+    async def test_open_circuit(self):
+        for _ in range(self.crawler.breaker.max_failures):
+            self.crawler.breaker.failure("127.0.0.1")
+        with self.assertRaises(crawler.CircuitOpen):
+            await self.open("/ok")
+
+
+class ReadLogoLinkTest(ServerTestCase):
+    """
+    Logo sources reported by `readLogoLink` for the pages of a crawl.
+    """
+
+    def routes(self):
+        html = {"content_type": "text/html"}
+        return [
+            web.get("/og", serve(b'<html><head><meta property="og:image" content="/og.png"></head></html>', **html)),
+            web.get("/favicon", serve(b'<html><head><link rel="icon" href="/favicon.ico"></head></html>', **html)),
+            web.get("/nothing", serve(b"<html><head></head><body>hello</body></html>", **html)),
+            web.get("/photo.jpg", serve(b"\xff\xd8\xff", content_type="image/jpeg")),
+        ]
+
+    async def test_sources(self):
+        results = await self.crawl("/og", "/favicon", "/nothing", "/photo.jpg")
+        outcomes = {url: (row["success"], row["logo_link"], row["request_type"], row["message"])
+                    for url, row in results.items()}
+        self.assertEqual(outcomes, {
+            self.origin + "/og": ("True", self.origin + "/og.png", "headed", "og_image"),
+            self.origin + "/favicon": ("True", self.origin + "/favicon.ico", "headed", "favicon"),
+            self.origin + "/nothing": ("False", "None", "headed", "not_found"),
+            self.origin + "/photo.jpg": ("False", "None", "headed", "non_html"),
+        })
+
+    async def test_connection_error(self):
+        with mock.patch.object(self.server, "port", 1):
+            results = await self.crawl("")
+        self.assertEqual(results["127.0.0.1:1"], {"url": "127.0.0.1:1", "success": "False", "logo_link": "None",
+                                                  "request_type": "", "message": "Error ClientConnectorError"})
+
+
+class CommonPathTest(ServerTestCase):
+    """
+    A logo at a common path of the origin, found by `readLogoLink` without parsing the page.
+    """
+
+    def routes(self):
+        return [
+            web.get("/og", serve(b'<html><head><meta property="og:image" content="/og.png"></head></html>',
+                                 content_type="text/html")),
+            web.get("/logo.png", serve(b"\x89PNG", content_type="image/png")),
+        ]
+
+    async def test_common_path_takes_precedence(self):
+        result = (await self.crawl("/og"))[self.origin + "/og"]
+        self.assertEqual((result["success"], result["logo_link"], result["message"]),
+                         ("True", self.origin + "/logo.png", "common_path"))
+
+
+class ExportTest(unittest.TestCase):
+    """
+    Results written by `exportResult` and the metrics computed from them by `exportMetrics`.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+        self.crawler = make_crawler(metrics_file="metrics.csv")
+
+    def test_export(self):
+        results = [
+            {"url": "https://a.com", "success": True, "logo_link": "https://a.com/logo.png", "request_type": "headed",
+             "message": "common_path"},
+            {"url": "https://b.com", "success": False, "logo_link": "None", "request_type": "headless",
+             "message": "not_found"},
+            {"url": "c.com", "success": False, "logo_link": "None", "request_type": None, "message": "404"},
+            {"url": "d.com", "success": False, "logo_link": "None", "request_type": None, "message": "404"},
+        ]
+        output = io.StringIO()
+        writer = csv.writer(output)
+        for result in results:
+            self.crawler.exportResult(writer, result)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "https://a.com,True,https://a.com/logo.png,headed,common_path",
+            "https://b.com,False,None,headless,not_found",
+            "c.com,False,None,,404",
+            "d.com,False,None,,404",
+        ])
+
+        with mock.patch.object(crawler, "log"):
+            self.crawler.exportMetrics()
+        with open("output/metrics.csv") as f:
+            metrics = f.read()
+        for line in ("Total domains processed: 4",
+                     "Successful logo extractions: 1 (25.00%)",
+                     "Failed extractions: 3 (75.00%)",
+                     "- common_path: 1 (100.00% of successful, 25.00% of total)",
+                     "- 404: 2 (66.67% of failures, 50.00% of total)",
+                     "- Headed requests: 1 (25.00%)",
+                     "- Headless requests: 1 (25.00%)",
+                     "- Failed requests: 2 (50.00%)"):
+            self.assertIn(line, metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# Tests of the logo link extraction from an HTML document
+
+import threading
+import unittest
+from unittest import mock
+
+from logocrawler import crawler
+from logocrawler.crawler import LogoCrawler
+
+# -----------------------------------------------------------------------------------
+
+base_url = "https://www.example.com/"
+
+og_image = b'<meta property="og:image" content="/og.png">'
+img_logo = b'<img class="Site-Logo" src="/img.png">'
+favicon = b'<link rel="shortcut icon" href="/favicon.ico">'
+
+
+def page(head=b"", body=b""):
+    return b"<html><head>" + head + b"</head><body>" + body + b"</body></html>"
+
+
+class ParseLogoLinkTests:
+    """
+    Cases shared by both parsers; subclasses select the parser used by parseLogoLink.
+    """
+
+    def parse(self, content, encoding=None):
+        return LogoCrawler.parseLogoLink(content, base_url, encoding)
+
+    def test_priority(self):
+        self.assertEqual(self.parse(page(favicon + og_image, img_logo)), (base_url + "og.png", "og_image"))
+        self.assertEqual(self.parse(page(favicon, img_logo)), (base_url + "img.png", "img_logo"))
+        self.assertEqual(self.parse(page(favicon)), (base_url + "favicon.ico", "favicon"))
+        self.assertEqual(self.parse(page(body=b"<img src='/photo.png'>")), (None, "not_found"))
+
+    def test_img_logo_by_id(self):
+        self.assertEqual(self.parse(page(body=b'<img id="logo" src="logo.svg">')), (base_url + "logo.svg", "img_logo"))
+
+    def test_whitespace_links_are_skipped(self):
+        content = page(b'<meta property="og:image" content="  ">',
+                       b'<img class="logo" src=" \n"><img id="logo" src="/img.png">')
+        self.assertEqual(self.parse(content), (base_url + "img.png", "img_logo"))
+        self.assertEqual(self.parse(page(b'<link rel="icon" href=" ">')), (None, "not_found"))
+
+    def test_header_charset(self):
+        content = page(body='<img class="logo" src="/логотип.png">'.encode("windows-1251"))
+        self.assertEqual(self.parse(content, "windows-1251"), (base_url + "логотип.png", "img_logo"))
+
+    def test_unknown_charset(self):
+        self.assertEqual(self.parse(page(og_image), "no-such-charset"), (base_url + "og.png", "og_image"))
+
+
+class LxmlParseLogoLinkTest(ParseLogoLinkTests, unittest.TestCase):
+    """
+    parseLogoLink without selectolax installed.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(crawler, "LexborHTMLParser", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+@unittest.skipIf(crawler.LexborHTMLParser is None, "selectolax is not installed")
+class LexborParseLogoLinkTest(ParseLogoLinkTests, unittest.TestCase):
+    """
+    parseLogoLink with selectolax installed.
+    """
+
+
+class LxmlParserTest(unittest.TestCase):
+    """
+    lxml parsers are reused per thread and encoding, never shared between threads.
+    """
+
+    def test_one_parser_per_thread(self):
+        parser = crawler.lxml_parser("utf-8")
+        self.assertIs(crawler.lxml_parser("utf-8"), parser)
+        self.assertIsNot(crawler.lxml_parser("windows-1251"), parser)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(crawler.lxml_parser("utf-8")))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], parser)
+
+
+if __name__ == "__main__":
+    unittest.main()
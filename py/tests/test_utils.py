@@ -0,0 +1,41 @@
+# Tests of the URL helpers
+
+import unittest
+
+from logocrawler.utils import url_resolver
+
+# -----------------------------------------------------------------------------------
+
+class UrlResolverTest(unittest.TestCase):
+    """
+    Resolves links found on https://www.example.com/blog/post.html.
+    """
+
+    def setUp(self):
+        self.resolve = url_resolver("https://www.example.com/blog/post.html")
+
+    def test_absolute(self):
+        self.assertEqual(self.resolve("http://cdn.example.net/logo.png"), "http://cdn.example.net/logo.png")
+        self.assertEqual(self.resolve("https://cdn.example.net/logo.png"), "https://cdn.example.net/logo.png")
+
+    def test_protocol_relative(self):
+        self.assertEqual(self.resolve("//cdn.example.net/logo.png"), "https://cdn.example.net/logo.png")
+
+    def test_root_relative(self):
+        self.assertEqual(self.resolve("/img/logo.png"), "https://www.example.com/img/logo.png")
+
+    def test_relative(self):
+        self.assertEqual(self.resolve("logo.png"), "https://www.example.com/blog/logo.png")
+        self.assertEqual(self.resolve("../logo.png"), "https://www.example.com/logo.png")
+
+    def test_whitespace_is_stripped(self):
+        self.assertEqual(self.resolve("  /img/logo.png\n"), "https://www.example.com/img/logo.png")
+        self.assertEqual(self.resolve("/img/\tlo\r\ngo.png"), "https://www.example.com/img/logo.png")
+
+    def test_empty_link(self):
+        self.assertIsNone(self.resolve(""))
+        self.assertIsNone(self.resolve(" \t\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()